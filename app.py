@@ -1,27 +1,52 @@
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from student_api import student_history
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from datetime import datetime
-import locale
+from functools import lru_cache
 import uvicorn
 from subprocess import Popen
 import json
+import os
 
 app = FastAPI()
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates("templates")
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+templates.env.auto_reload = False
 
 
 with open('students.json', encoding='utf-8') as file:
     STUDENTS = json.load(file)
 
+WEEKDAYS = ('Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Вс')
+MONTHS = ('', 'янв', 'фев', 'мар', 'апр', 'мая', 'июн', 'июл', 'авг', 'сен', 'окт', 'ноя', 'дек')
+
+
+def format_russian_date(date):
+    return f"{WEEKDAYS[date.weekday()]} {date.day:02d}-{MONTHS[date.month]}-{date.year}"
+
+
+MONTH_NUMBERS = {
+    month: number for number, month in enumerate(
+        ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)
+}
+
+
+@lru_cache(maxsize=512)
+def parse_lesson_date(value):
+    # same as datetime.strptime(value, '%d-%b-%y') without the _strptime regex machinery
+    day, month, year = value.split('-')
+    return datetime(2000 + int(year), MONTH_NUMBERS[month.lower()], int(day))
+
 
 @app.get("/{student}")
 async def history(request: Request, student, query: int = 5):
     if not STUDENTS.get(student.lower()): return PlainTextResponse('ничего не найдено ^_^')
-    googlesheet_data = student_history(student)
+    googlesheet_data = await run_in_threadpool(student_history, student)
     number = int(googlesheet_data[1][0][0])
     message = (f'Доступно уроков: {number} \n', f'Неоплаченных уроков: {abs(number)} \n')[number<0]
     n = query
@@ -31,15 +56,10 @@ async def history(request: Request, student, query: int = 5):
 
         if not query: break
         if not lesson or len(lesson)<2: continue
-        if 'Оплата' not in lesson[1]: lesson[1] = 'Урок завершен'
-        lesson_date = datetime.strptime(lesson[0], '%d-%b-%y')
-        history.append((lesson_date, lesson[1]))
+        status = lesson[1] if 'Оплата' in lesson[1] else 'Урок завершен'
+        history.append(f"{format_russian_date(parse_lesson_date(lesson[0]))} {status}")
         query -= 1
     
-
-    locale.setlocale(locale.LC_ALL, 'ru_RU.UTF-8')
-    history = list(map(lambda x: f"{x[0].strftime('%a %d-%b-%Y')} {x[1]}", history))
-    locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
     return templates.TemplateResponse(
         "student.html",
         context={
@@ -57,6 +77,6 @@ if __name__ == '__main__':
     Popen(['python', '-m', 'https_redirect'])
     uvicorn.run(
         'app:app', port=443, host='0.0.0.0',
-        reload=True, reload_dirs=['html_files'],
+        workers=os.cpu_count(), loop='uvloop', http='httptools',
         ssl_keyfile='/etc/letsencrypt/live/mydomain.com/privkey.pem',
         ssl_certfile='/etc/letsencrypt/live/mydomain.com/fullchain.pem')
\ No newline at end of file
@@ -1,22 +1,90 @@
 import gspread
+from gspread.utils import absolute_range_name
+import logging
 import pathlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 
 
 SHEET = 'schedule'
 DIR = pathlib.Path(__file__).parent.resolve()
 CREDENTIALS = 'credentials.json'
+CACHE_TTL = 30  # seconds
+CACHE_REFRESH_AGE = 0.8 * CACHE_TTL  # hits older than this refetch the entry in the background
+CACHE_STALE_TTL = 2 * CACHE_TTL  # expired entries are still served while another request refreshes them
+CACHE_MAXSIZE = 256  # students kept in memory, least recently used are evicted first
 
-def connect_excel(worksheet):
+logger = logging.getLogger(__name__)
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_locks = {}
+
+@lru_cache(maxsize=None)
+def connect_sheet():
     sa = gspread.service_account(os.path.join(DIR, CREDENTIALS))
-    sheet = sa.open(SHEET) 
-    worksheet = sheet.worksheet(worksheet)
-    return worksheet
+    return sa.open(SHEET)
 
-def student_history(student: str):
-    worksheet = connect_excel(student.capitalize())
+def fetch_history(student: str):
+    # address the ranges by sheet name: one values:batchGet call, no worksheet metadata lookup
+    worksheet = student.capitalize()
+    ranges = [absolute_range_name(worksheet, "B5:C"), absolute_range_name(worksheet, "E3:E4")]
     try:
-        result = worksheet.batch_get([f"B5:C10000", "E3:E4"])
-    except Exception as e:
-        print(e)
-    return result
\ No newline at end of file
+        result = connect_sheet().values_batch_get(ranges)
+    except Exception:
+        logger.exception("failed to fetch history for %s", worksheet)
+        raise
+    return [value_range.get('values', []) for value_range in result['valueRanges']]
+
+def cache_get(key):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry:
+            _cache.move_to_end(key)
+        return entry
+
+def cache_set(key, entry):
+    with _cache_lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        if len(_cache) > CACHE_MAXSIZE:
+            _cache.popitem(last=False)
+
+def freeze(value_ranges):
+    # cached rows are shared by every request, so store them immutable
+    return tuple(tuple(map(tuple, rows)) for rows in value_ranges)
+
+def load_history(key, student):
+    result = freeze(fetch_history(student))
+    cache_set(key, (time.monotonic(), result))
+    return result
+
+def refresh_history(key, student, lock):
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        load_history(key, student)
+    except Exception:
+        pass  # already logged by fetch_history; the cached entry is kept until it goes stale
+    finally:
+        lock.release()
+
+def student_history(student: str):
+    key = student.lower()
+    # one lock per student: concurrent misses wait for a single Sheets call
+    lock = _locks.setdefault(key, threading.Lock())
+    entry = cache_get(key)
+    if entry:
+        age = time.monotonic() - entry[0]
+        if CACHE_REFRESH_AGE < age < CACHE_TTL and not lock.locked():
+            threading.Thread(target=refresh_history, args=(key, student, lock), daemon=True).start()
+        if age < CACHE_TTL or age < CACHE_STALE_TTL and lock.locked():
+            return entry[1]
+    with lock:
+        entry = cache_get(key)
+        if entry and time.monotonic() - entry[0] < CACHE_TTL:
+            return entry[1]
+        return load_history(key, student)
\ No newline at end of file